@@ -4,69 +4,128 @@ Refactored for better maintainability, error handling, and architecture.
 Using CoinGecko API and others for market data.
 """
 
-from flask import Flask, render_template, jsonify, request
+# Patch blocking stdlib I/O before anything imports it, so requests, the thread
+# pools and logging all cooperate with gevent workers
+from gevent import monkey
+monkey.patch_all()
+
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
+import atexit
+import hashlib
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 import os
 import secrets
 
 from config import Config as AppConfig
-from services.market_data_service import MarketDataService
+from services.market_data_service import MarketDataService, start_connection_warmup
 from services.signal_service import SignalService
 from services.cache_service import CacheService
 from utils.validators import InputValidator
 from utils.exceptions import AppException, DataFetchError, ValidationError
 from utils.response_formatter import ResponseFormatter
+from utils.json_provider import ORJSONProvider, dumps_bytes
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
+# Configure logging. Request threads only enqueue records; a background
+# listener does the formatting and the file/console writes.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('app.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener.start()
+# Threads don't survive fork, so preloaded gunicorn workers each need their
+# own listener. Drain the queue first: records still on it would be copied
+# into every child and written once per process.
+os.register_at_fork(
+    before=_log_listener.stop,
+    after_in_parent=_log_listener.start,
+    after_in_child=_log_listener.start
 )
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Static pages rendered once at startup; they take no template context
+PAGE_TEMPLATES = ('index', 'group1', 'group2', 'group3', 'group4', 'macd-rsi')
+
 class CryptoTradingApp:
     """Main application class for crypto trading signal analysis."""
 
     def __init__(self, config=None):
         self.config = config or AppConfig()
         self.app = Flask(__name__, template_folder='templates')
+        self.app.json = ORJSONProvider(self.app)
         self.app.secret_key = os.environ.get("SESSION_SECRET") or secrets.token_urlsafe(32)
         if not os.environ.get("SESSION_SECRET"):
             logger.warning("Using auto-generated session secret - set SESSION_SECRET env var for production")
         CORS(self.app)
 
         # Initialize services
-        self.cache_service = CacheService(ttl=self.config.CACHE_TTL)
+        self.cache_service = CacheService(
+            ttl=self.config.CACHE_TTL,
+            namespace_ttls={
+                'coins': self.config.CACHE_TTL_LISTS,
+                'exchanges': self.config.CACHE_TTL_LISTS,
+                'realtime': self.config.CACHE_TTL_REALTIME,
+            }
+        )
         self.market_data_service = MarketDataService(self.config, self.cache_service)
         self.signal_service = SignalService(self.config)
         self.validator = InputValidator()
         self.response_formatter = ResponseFormatter()
+        self.executor = ThreadPoolExecutor(max_workers=self.config.FETCH_WORKERS)
 
+        self._prerender_pages()
         self._register_routes()
         self._register_error_handlers()
         logger.info("Crypto Trading Application initialized successfully")
 
+    def _prerender_pages(self):
+        """Render the static page templates once so requests skip Jinja."""
+        available = set(self.app.jinja_env.list_templates())
+        with self.app.app_context():
+            self._pages = {
+                name: render_template(f'{name}.html').encode('utf-8')
+                for name in PAGE_TEMPLATES
+                if f'{name}.html' in available
+            }
+
+    def _page(self, name):
+        html = self._pages.get(name)
+        if html is None:
+            # Template wasn't there at startup; render (or fail) as usual
+            return render_template(f'{name}.html')
+        return Response(html, mimetype='text/html', headers={
+            'Cache-Control': f'public, max-age={self.config.PAGE_CACHE_MAX_AGE}'
+        })
+
     def _register_routes(self):
         """Register all application routes."""
-        self.app.add_url_rule('/', view_func=self.index)
-        self.app.add_url_rule('/group1', view_func=self.group1)
-        self.app.add_url_rule('/group2', view_func=self.group2)
-        self.app.add_url_rule('/group3', view_func=self.group3)
-        self.app.add_url_rule('/group4', view_func=self.group4)
-        self.app.add_url_rule('/macd-rsi', view_func=self.macd_rsi)
-
-        self.app.add_url_rule('/api/data', view_func=self.api_get_data, methods=['GET'])
-        self.app.add_url_rule('/api/coins', view_func=self.api_get_coins, methods=['GET'])
-        self.app.add_url_rule('/api/exchanges', view_func=self.api_get_exchanges, methods=['GET'])
-        self.app.add_url_rule('/api/chainlink-volume', view_func=self.api_get_volume, methods=['GET'])
-        self.app.add_url_rule('/api/refresh', view_func=self.api_refresh, methods=['POST'])
-        self.app.add_url_rule('/api/health', view_func=self.api_health, methods=['GET'])
+        routes = (
+            ('/', 'index', self.index, ('GET',)),
+            ('/group1', 'group1', self.group1, ('GET',)),
+            ('/group2', 'group2', self.group2, ('GET',)),
+            ('/group3', 'group3', self.group3, ('GET',)),
+            ('/group4', 'group4', self.group4, ('GET',)),
+            ('/macd-rsi', 'macd_rsi', self.macd_rsi, ('GET',)),
+
+            ('/api/data', 'api_get_data', self.api_get_data, ('GET',)),
+            ('/api/coins', 'api_get_coins', self.api_get_coins, ('GET',)),
+            ('/api/exchanges', 'api_get_exchanges', self.api_get_exchanges, ('GET',)),
+            ('/api/chainlink-volume', 'api_get_volume', self.api_get_volume, ('GET',)),
+            ('/api/refresh', 'api_refresh', self.api_refresh, ('POST',)),
+            ('/api/health', 'api_health', self.api_health, ('GET',)),
+        )
+        for path, endpoint, view_func, methods in routes:
+            self.app.add_url_rule(path, endpoint=endpoint, view_func=view_func, methods=list(methods))
 
     def _register_error_handlers(self):
         """Register error handlers for the application."""
@@ -105,51 +164,93 @@ class CryptoTradingApp:
 
     # Page routes
     def index(self):
-        return render_template('index.html')
+        return self._page('index')
     def group1(self):
-        return render_template('group1.html')
+        return self._page('group1')
     def group2(self):
-        return render_template('group2.html')
+        return self._page('group2')
     def group3(self):
-        return render_template('group3.html')
+        return self._page('group3')
     def group4(self):
-        return render_template('group4.html')
+        return self._page('group4')
     def macd_rsi(self):
-        return render_template('macd-rsi.html')
+        return self._page('macd-rsi')
 
     # API routes
     def api_get_data(self):
         try:
             params = self.validator.validate_data_request(request.args)
-            market_data = self.market_data_service.get_market_data(
-                coin_id=params['coin_id'],
-                days=params['days'],
-                exchange=params.get('exchange')
+            # Cache hits skip fetching, signal math and serialization entirely
+            payload, etag, _ = self.cache_service.get_or_fetch(
+                f"resp_{params['coin_id']}_{params['days']}_{params['group']}",
+                lambda: self._build_data_payload(params),
+                namespace='response_bytes',
+                ttl=lambda built: built[2]
             )
-            signals = self.signal_service.calculate_signals(
-                market_data.df,
-                signal_group=params['group']
-            )
-            realtime_data = self.market_data_service.get_realtime_data(params['coin_id'])
-            response_data = self.response_formatter.format_market_response(
-                market_data=market_data,
-                signals=signals,
-                realtime_data=realtime_data,
-                coin_id=params['coin_id']
-            )
-            logger.info(f"Successfully fetched data for {params['coin_id']}")
-            return jsonify(response_data)
+            return self._conditional_json(payload, etag)
         except (ValidationError, DataFetchError, AppException):
             raise
         except Exception as e:
             logger.error(f"Unexpected error in api_get_data: {str(e)}", exc_info=True)
             raise AppException(f"Failed to process data request: {str(e)}")
 
+    def _build_data_payload(self, params):
+        """
+        Fetch, analyse and serialize the /api/data response for `params`.
+        Returns the payload, its ETag and how long it may be cached.
+        """
+        # Realtime quotes don't depend on the history, fetch them alongside it
+        realtime_future = self.executor.submit(
+            self.market_data_service.get_realtime_data, params['coin_id']
+        )
+        market_data = self.market_data_service.get_market_data(
+            coin_id=params['coin_id'],
+            days=params['days'],
+            exchange=params.get('exchange')
+        )
+        signals = self.signal_service.calculate_signals(
+            market_data.df,
+            signal_group=params['group']
+        )
+        realtime_data = realtime_future.result()
+        payload = self.response_formatter.format_market_response_bytes(
+            market_data=market_data,
+            signals=signals,
+            realtime_data=realtime_data,
+            coin_id=params['coin_id']
+        )
+        logger.info(f"Successfully fetched data for {params['coin_id']}")
+        # The payload can't outlive the cached quotes and history it embeds;
+        # an empty quote block was never cached, so it isn't pinned either
+        ttl = self.market_data_service.cached_ttl(params['coin_id'], params['days'])
+        return (*self._with_etag(payload), ttl)
+
+    def _serialize_with_etag(self, obj):
+        """JSON bytes for `obj` plus a content hash to use as its ETag."""
+        return self._with_etag(dumps_bytes(obj))
+
+    def _with_etag(self, payload):
+        return payload, hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+    def _conditional_json(self, payload, etag):
+        """JSON response that becomes an empty 304 if the client already has `etag`."""
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(payload, mimetype='application/json')
+        response.set_etag(etag)
+        return response
+
     def api_get_coins(self):
         try:
-            coins = self.market_data_service.get_supported_coins()
-            logger.info(f"Retrieved {len(coins)} supported coins")
-            return jsonify(coins)
+            def build():
+                coins = self.market_data_service.get_supported_coins()
+                logger.info(f"Retrieved {len(coins)} supported coins")
+                return self._serialize_with_etag(coins)
+            payload, etag = self.cache_service.get_or_fetch(
+                'resp_supported_coins', build, namespace='coins'
+            )
+            return self._conditional_json(payload, etag)
         except Exception as e:
             logger.error(f"Error fetching coins list: {str(e)}")
             raise AppException(f"Failed to fetch supported coins: {str(e)}")
@@ -230,6 +331,7 @@ application = create_app()
 if __name__ == '__main__':
     config = AppConfig()
     crypto_app = CryptoTradingApp(config)
+    start_connection_warmup()
     crypto_app.run(
         host=config.HOST,
         port=config.PORT,
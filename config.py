@@ -14,6 +14,23 @@ class Config:
     PROVIDER_RETRY_ATTEMPTS = int(os.getenv('PROVIDER_RETRY_ATTEMPTS', 2))
     PROVIDER_BACKOFF_FACTOR = float(os.getenv('PROVIDER_BACKOFF_FACTOR', 0.5))
 
+    # Overall budget for one realtime quote fan-out across providers
+    REALTIME_TIMEOUT = float(os.getenv('REALTIME_TIMEOUT', 3.0))
+
+    # Client-side ceiling on CoinGecko calls per minute (free tier allows ~30-50),
+    # for the whole deployment. Every server process keeps its own bucket, so
+    # each gets an equal share across WEB_CONCURRENCY workers.
+    COINGECKO_RATE_LIMIT = int(os.getenv('COINGECKO_RATE_LIMIT', 45))
+    WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+    COINGECKO_WORKER_RATE_LIMIT = max(COINGECKO_RATE_LIMIT // WEB_CONCURRENCY, 1)
+
+    # Skip a provider for BREAKER_COOLDOWN seconds after this many failures in a row
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 3))
+    BREAKER_COOLDOWN = float(os.getenv('BREAKER_COOLDOWN', 30.0))
+
+    # Threads used to issue independent upstream requests concurrently
+    FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', 16))
+
     # Provider priority order
     PROVIDER_CHAIN = [
         'CoinGecko',
@@ -24,10 +41,23 @@ class Config:
         'CoinMarketCap'
     ]
 
+    # Browser/CDN cache lifetime for the static HTML pages
+    PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', 300))
+
     # Flask app settings
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
 
-    # Unified cache TTL for app.py
+    # Market data cache TTL for app.py
     CACHE_TTL = CACHE_TTL_SECONDS
+    # Coin/exchange lists change rarely; realtime quotes go stale quickly
+    CACHE_TTL_LISTS = int(os.getenv('CACHE_TTL_LISTS', 21600))
+    CACHE_TTL_REALTIME = int(os.getenv('CACHE_TTL_REALTIME', 15))
+    # Realtime TTL is scaled per coin so a cached price moves by about this
+    # fraction before it's refreshed, within [REALTIME_TTL_MIN, REALTIME_TTL_MAX]
+    REALTIME_TARGET_DRIFT = float(os.getenv('REALTIME_TARGET_DRIFT', 0.001))
+    REALTIME_TTL_MIN = float(os.getenv('REALTIME_TTL_MIN', 2))
+    REALTIME_TTL_MAX = float(os.getenv('REALTIME_TTL_MAX', 300))
+    # Price samples needed before a coin's TTL may grow past CACHE_TTL_REALTIME
+    REALTIME_MIN_SAMPLES = int(os.getenv('REALTIME_MIN_SAMPLES', 3))
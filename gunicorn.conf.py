@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for serving `app:application`.
+
+Handlers spend most of their time waiting on upstream market-data APIs,
+so workers are gevent-based: every blocking socket call yields, and one
+worker keeps many requests in flight at once.
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+# Config splits per-deployment limits (COINGECKO_RATE_LIMIT) across workers
+os.environ['WEB_CONCURRENCY'] = str(workers)
+worker_class = 'gevent'
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+# Import the app (and warm its module-level state) once in the master
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+keepalive = 5
+
+
+def post_worker_init(worker):
+    # Each worker warms its own connection pool; sockets opened in the master
+    # before the fork would be shared between processes
+    from services.market_data_service import start_connection_warmup
+    start_connection_warmup()
@@ -1,19 +1,166 @@
-from cachetools import TTLCache
+import logging
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from cachetools import TLRUCache
+
+logger = logging.getLogger(__name__)
+
+# `delta` is how long the value took to fetch; it scales early refreshes
+_Entry = namedtuple('_Entry', ['value', 'expiry', 'delta'])
+
+# namespace -> (maxsize, default TTL in seconds). Coin and exchange lists
+# barely change within a day while realtime quotes go stale in seconds.
+NAMESPACES = {
+    'coins': (50, 21600),
+    'exchanges': (50, 21600),
+    'market': (200, 300),
+    'realtime': (200, 15),
+    # Serialized API responses, keyed by request parameters. Ones built from
+    # other cached data get a TTL matching what they embed.
+    'response_bytes': (200, 15),
+}
+# Fraction of the TTL added at random so entries written together don't expire together
+TTL_JITTER = 0.1
+# Seconds a miss waits on another caller's fetch of the same key before
+# giving up on it and fetching for itself
+WAIT_TIMEOUT = 10.0
+
+
+def _entry_expiry(key, entry, now):
+    return entry.expiry
 
 class CacheService:
-    """Simple in-memory cache service with TTL."""
+    """Simple in-memory cache service with per-namespace TTLs."""
+    
+    def __init__(self, ttl: int = 300, namespace_ttls: dict = None, beta: float = 1.0):
+        # `ttl` applies to market data; other namespaces can be overridden individually
+        self.ttls = {name: default_ttl for name, (_, default_ttl) in NAMESPACES.items()}
+        self.ttls['market'] = ttl
+        self.ttls.update(namespace_ttls or {})
+        # Higher beta refreshes earlier ahead of expiry (XFetch)
+        self.beta = beta
+        self.caches = {
+            name: TLRUCache(maxsize=maxsize, ttu=_entry_expiry, timer=time.monotonic)
+            for name, (maxsize, _) in NAMESPACES.items()
+        }
+        # Futures for fetches currently running, so concurrent misses share one fetch
+        self._inflight = {}
+        # Early refreshes submitted but not yet started; misses don't wait on these
+        self._queued_refreshes = set()
+        self._lock = threading.RLock()
+        self._refresher = ThreadPoolExecutor(max_workers=4)
+    
+    def get(self, key, namespace='market'):
+        with self._lock:
+            entry = self.caches[namespace].get(key)
+        return entry.value if entry is not None else None
+    
+    def remaining_ttl(self, key, namespace='market'):
+        """
+        Seconds until `key` expires, 0 if it isn't cached. Jitter is already
+        taken off, so a value stored with this TTL won't outlive `key`.
+        """
+        with self._lock:
+            entry = self.caches[namespace].get(key)
+        if entry is None:
+            return 0
+        return max(entry.expiry - time.monotonic(), 0) / (1 + TTL_JITTER)
+    
+    def set(self, key, value, namespace='market', ttl=None):
+        """Store `value`; `ttl` overrides the namespace TTL for this entry."""
+        self._store(namespace, key, value, delta=0.0, ttl=ttl)
+    
+    def get_or_fetch(self, key, fetch, namespace='market', ttl=None):
+        """
+        Return the cached value for `key`, calling `fetch()` on a miss.
+        Concurrent misses on the same key wait (up to WAIT_TIMEOUT) for the
+        first caller's fetch instead of starting their own. As expiry
+        approaches, a hit may also start a background refresh so the next
+        caller doesn't see a miss.
+        `ttl` overrides the namespace TTL and may be a function of the
+        fetched value; a TTL of 0 hands the value to waiters without caching it.
+        """
+        inflight_key = (namespace, key)
+        with self._lock:
+            entry = self.caches[namespace].get(key)
+            if entry is not None:
+                if (inflight_key not in self._inflight
+                        and inflight_key not in self._queued_refreshes
+                        and self._should_refresh(entry)):
+                    self._queued_refreshes.add(inflight_key)
+                    self._refresher.submit(self._refresh, namespace, key, fetch, entry, ttl)
+                return entry.value
+            future = self._inflight.get(inflight_key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[inflight_key] = Future()
+        if not is_owner:
+            try:
+                return future.result(timeout=WAIT_TIMEOUT)
+            except FutureTimeoutError:
+                # Don't hang on a stuck fetch; the owner still stores its value
+                logger.warning(f"Fetch of {key} still running after {WAIT_TIMEOUT}s, fetching again")
+                return fetch()
+        return self._fetch(namespace, key, fetch, future, ttl)
+    
+    def _should_refresh(self, entry):
+        # Probabilistic early expiration: fires sooner for slow-to-fetch values
+        jitter = -entry.delta * self.beta * math.log(1.0 - random.random())
+        return time.monotonic() + jitter >= entry.expiry
     
-    def __init__(self, ttl: int = 300):
-        self.cache = TTLCache(maxsize=100, ttl=ttl)
+    def _fetch(self, namespace, key, fetch, future, ttl=None):
+        start = time.monotonic()
+        # Anything that fails here, the TTL callback included, must still
+        # release the waiters and the in-flight slot
+        try:
+            value = fetch()
+            delta = time.monotonic() - start
+            if callable(ttl):
+                ttl = ttl(value)
+            if ttl is None or ttl > 0:
+                self._store(namespace, key, value, delta, ttl)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop((namespace, key), None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop((namespace, key), None)
+        future.set_result(value)
+        return value
     
-    def get(self, key):
-        return self.cache.get(key)
+    def _refresh(self, namespace, key, fetch, stale, ttl=None):
+        # Claim the in-flight slot only now: a miss while this sat in the
+        # queue fetched for itself instead of waiting behind other refreshes,
+        # and may have replaced the `stale` entry already
+        inflight_key = (namespace, key)
+        with self._lock:
+            self._queued_refreshes.discard(inflight_key)
+            current = self.caches[namespace].get(key)
+            if inflight_key in self._inflight or (current is not None and current is not stale):
+                return
+            future = self._inflight[inflight_key] = Future()
+        try:
+            self._fetch(namespace, key, fetch, future, ttl)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
     
-    def set(self, key, value):
-        self.cache[key] = value
+    def _store(self, namespace, key, value, delta, ttl=None):
+        if ttl is None:
+            ttl = self.ttls[namespace]
+        expiry = time.monotonic() + ttl + random.uniform(0, ttl * TTL_JITTER)
+        with self._lock:
+            self.caches[namespace][key] = _Entry(value, expiry, delta)
     
     def clear_all(self):
-        self.cache.clear()
+        with self._lock:
+            for cache in self.caches.values():
+                cache.clear()
     
     def health_check(self):
         return {"status": "healthy"}
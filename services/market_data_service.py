@@ -1,5 +1,221 @@
+import functools
+import logging
 import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import ijson
+import numpy as np
+import orjson
+import pandas as pd
+from numba import njit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+from utils.batcher import RequestBatcher
+from utils.circuit_breaker import CircuitBreaker
+from utils.exceptions import DataFetchError
+from utils.rate_limiter import RateLimiter, RateLimitTimeout
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+COINCAP_ASSET_URL = "https://api.coincap.io/v2/assets/%s"
+COINLORE_TICKER_URL = "https://api.coinlore.net/api/ticker/"
+COINPAPRIKA_TICKER_URL = "https://api.coinpaprika.com/v1/tickers/%s"
+CRYPTOCOMPARE_QUOTES_URL = "https://min-api.cryptocompare.com/data/pricemultifull"
+COINMARKETCAP_QUOTES_URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+# Fixed part of the CoinGecko /simple/price query; only `ids` varies per call
+COINGECKO_QUOTE_PARAMS = {
+    'vs_currencies': 'usd',
+    'include_market_cap': 'true',
+    'include_24hr_vol': 'true',
+    'include_24hr_change': 'true'
+}
+MS_PER_DAY = 86_400_000
+# Realtime fan-out: query the best-ranked providers in parallel and stop
+# waiting once enough of them have answered for a consensus
+REALTIME_SHORTLIST = 3
+REALTIME_QUORUM = 2
+# Weight of the latest sample in the provider answer-rate, latency and price-drift averages
+EWMA_ALPHA = 0.2
+# Most a coin's realtime TTL may grow from one fetch to the next
+REALTIME_TTL_GROWTH = 2.0
+# How long multi-symbol quote endpoints collect concurrent lookups into one request
+BATCH_WINDOW = 0.02
+# Longest we'll back off between retries of a rate-limited CoinGecko call
+COINGECKO_MAX_BACKOFF = 8.0
+
+# Metrics every realtime provider fetcher returns, combined by median
+QUOTE_FIELDS = ('price', 'market_cap', 'volume_24h', 'price_change_24h')
+
+MarketData = namedtuple('MarketData', ['df'])
+
+# One keep-alive pool per process, shared by every service instance and provider,
+# so repeat calls to a host reuse an open TCP+TLS connection
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=100))
+# CoinGecko is the only source of history, so ride out its transient 5xx errors.
+# 429s are retried in _get_coingecko_json instead, where each retry goes
+# through the rate limiter and the Retry-After wait is capped.
+SESSION.mount(COINGECKO_BASE_URL, HTTPAdapter(
+    pool_maxsize=100,
+    max_retries=Retry(
+        total=Config.PROVIDER_RETRY_ATTEMPTS,
+        backoff_factor=Config.PROVIDER_BACKOFF_FACTOR,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+))
+
+# A URL on each host the realtime fetchers talk to, with the Config key each
+# one needs (if any). CoinGecko's must sit under COINGECKO_BASE_URL so the
+# warm-up fills that adapter's pool rather than the generic one.
+WARMUP_URLS = (
+    (f"{COINGECKO_BASE_URL}/ping", None),
+    ('https://api.coincap.io/', None),
+    ('https://api.coinlore.net/', None),
+    ('https://api.coinpaprika.com/', 'COINPAPRIKA_API_KEY'),
+    ('https://min-api.cryptocompare.com/', 'CRYPTOCOMPARE_API_KEY'),
+    ('https://pro-api.coinmarketcap.com/', 'COINMARKETCAP_API_KEY'),
+)
+
+# Provider-specific identifiers for the CoinGecko ids we know about.
+# CoinGecko itself is queried with the id as given.
+COINCAP_IDS = {
+    'bitcoin': 'bitcoin',
+    'ethereum': 'ethereum',
+    'chainlink': 'chainlink',
+}
+COINLORE_IDS = {
+    'bitcoin': '90',
+    'ethereum': '80',
+    'chainlink': '2751',
+}
+COINPAPRIKA_IDS = {
+    'bitcoin': 'btc-bitcoin',
+    'ethereum': 'eth-ethereum',
+    'chainlink': 'link-chainlink',
+}
+TICKER_SYMBOLS = {
+    'bitcoin': 'BTC',
+    'ethereum': 'ETH',
+    'chainlink': 'LINK',
+}
+
+
+def warm_up_connections():
+    """
+    HEAD each enabled provider host once so DNS, TCP and TLS setup is done
+    before the first real request; the connections stay in SESSION's pool.
+    """
+    for url, key_name in WARMUP_URLS:
+        if key_name and not getattr(Config, key_name):
+            continue
+        try:
+            SESSION.head(url, timeout=5)
+        except requests.RequestException as e:
+            logger.debug(f"Warm-up of {url} failed: {e}")
+
+
+def start_connection_warmup():
+    """
+    Warm the pool in the background. Call this in the serving process:
+    sockets opened before a fork would be shared with the parent.
+    """
+    threading.Thread(target=warm_up_connections, name='connection-warmup', daemon=True).start()
+
+
+def consensus_quote(results):
+    """
+    Median of each QUOTE_FIELDS metric across provider results, ignoring
+    missing values; None for a metric no provider reported.
+    """
+    if not results:
+        return dict.fromkeys(QUOTE_FIELDS)
+    # One row per provider, NaN where it left a metric out
+    samples = np.array([[r[f] for f in QUOTE_FIELDS] for r in results], dtype=np.float64)
+    reported = ~np.isnan(samples).all(axis=0)
+    medians = np.nanmedian(np.where(reported, samples, 0.0), axis=0)
+    return {
+        field: median if ok else None
+        for field, median, ok in zip(QUOTE_FIELDS, medians.tolist(), reported.tolist())
+    }
+
+
+def _align_to(timestamps, points):
+    """
+    Values of the `[ms_timestamp, value]` series at each of `timestamps`.
+    Chart points don't land exactly on candle times, so each timestamp takes
+    the latest point at or before it (NaN if there is none).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.size == 0:
+        return np.full(len(timestamps), np.nan)
+    if len(points) == len(timestamps) and np.array_equal(points[:, 0], timestamps):
+        return points[:, 1]
+    pos = np.searchsorted(points[:, 0], timestamps, side='right') - 1
+    values = points[pos, 1]
+    values[pos < 0] = np.nan
+    return values
+
+
+@njit(cache=True)
+def _daily_ohlcv(ts_ms, o, h, l, c, v, mc):
+    """
+    Roll time-sorted candles up to UTC days in a single scan: first open,
+    max high, min low, last close, and the last non-NaN volume and market cap.
+    Returns the day-start timestamps (ms) followed by the six daily columns.
+    """
+    n = ts_ms.shape[0]
+    day_ts = np.empty(n)
+    do, dh, dl, dc = np.empty(n), np.empty(n), np.empty(n), np.empty(n)
+    dv, dmc = np.empty(n), np.empty(n)
+    k = -1
+    current_day = 0.0
+    for i in range(n):
+        day = ts_ms[i] // MS_PER_DAY
+        if k < 0 or day != current_day:
+            k += 1
+            current_day = day
+            day_ts[k] = day * MS_PER_DAY
+            do[k], dh[k], dl[k], dc[k] = o[i], h[i], l[i], c[i]
+            dv[k], dmc[k] = v[i], mc[i]
+        else:
+            if h[i] > dh[k]:
+                dh[k] = h[i]
+            if l[i] < dl[k]:
+                dl[k] = l[i]
+            dc[k] = c[i]
+            if not np.isnan(v[i]):
+                dv[k] = v[i]
+            if not np.isnan(mc[i]):
+                dmc[k] = mc[i]
+    k += 1
+    return day_ts[:k], do[:k], dh[:k], dl[:k], dc[:k], dv[:k], dmc[:k]
+
+
+def _loads(resp):
+    """
+    Decode a JSON response body with orjson. A malformed body raises
+    requests' InvalidJSONError, as resp.json() did, so callers handling
+    RequestException cover it.
+    """
+    try:
+        return orjson.loads(resp.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON from {resp.url}: {e}", response=resp)
+
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
 
 class MarketDataService:
     def __init__(self, config, cache_service):
@@ -10,6 +226,10 @@ class MarketDataService:
             'cryptocompare': os.getenv('CRYPTOCOMPARE_API_KEY'),
             'coinmarketcap': os.getenv('COINMARKETCAP_API_KEY'),
         }
+        # Auth headers don't change for the life of the service, so build them once
+        self._coinpaprika_headers = {'Authorization': self.api_keys['coinpaprika']}
+        self._cryptocompare_headers = {'authorization': f"Apikey {self.api_keys['cryptocompare']}"}
+        self._coinmarketcap_headers = {'X-CMC_PRO_API_KEY': self.api_keys['coinmarketcap']}
         # Only add providers that either don't need keys, or have keys present
         self.providers = [
             self._get_coingecko,
@@ -22,5 +242,426 @@ class MarketDataService:
             self.providers.append(self._get_cryptocompare)
         if self.api_keys['coinmarketcap']:
             self.providers.append(self._get_coinmarketcap)
+        # Enabled providers that can answer for each coin we have ids for.
+        # CoinGecko takes the id as given, so it is the only one for any other coin.
+        id_maps = {
+            '_get_coincap': COINCAP_IDS,
+            '_get_coinlore': COINLORE_IDS,
+            '_get_coinpaprika': COINPAPRIKA_IDS,
+            '_get_cryptocompare': TICKER_SYMBOLS,
+            '_get_coinmarketcap': TICKER_SYMBOLS,
+        }
+        self._coverage = {}
+        for provider in self.providers:
+            for coin_id in id_maps.get(provider.__name__, ()):
+                self._coverage.setdefault(coin_id, [self._get_coingecko]).append(provider)
+        # Per-coin EWMA of relative price change per second, with its sample
+        # count and last TTL, and the (price, monotonic time) it was last measured from
+        self._price_drift = {}
+        self._last_price = {}
+        # Moving averages of how often and how fast each provider answers, used to rank them
+        self._answer_rate = {p.__name__: 1.0 for p in self.providers}
+        self._latency = {p.__name__: 0.0 for p in self.providers}
+        # Stop calling providers that keep failing until they've had time to recover
+        self._breaker = CircuitBreaker(self.config.BREAKER_FAILURE_THRESHOLD, self.config.BREAKER_COOLDOWN)
+        # Queue CoinGecko calls locally rather than spending quota on 429s
+        self._cg_limiter = RateLimiter(self.config.COINGECKO_WORKER_RATE_LIMIT, 60)
+        # Concurrent quote lookups for different coins share one multi-symbol request
+        self._coingecko_batch = RequestBatcher(self._fetch_coingecko_quotes, BATCH_WINDOW)
+        self._cryptocompare_batch = RequestBatcher(self._fetch_cryptocompare_quotes, BATCH_WINDOW)
+        self._coinmarketcap_batch = RequestBatcher(self._fetch_coinmarketcap_quotes, BATCH_WINDOW)
+        # Shared pool for issuing independent upstream requests concurrently
+        self.executor = ThreadPoolExecutor(max_workers=self.config.FETCH_WORKERS)
+
+    def health_check(self):
+        return {
+            "status": "healthy",
+            "providers": [p.__name__[len('_get_'):] for p in self.providers],
+            "open_circuits": [name[len('_get_'):] for name in self._breaker.open_names()]
+        }
+
+    def _get_json(self, url, params=None, headers=None):
+        resp = SESSION.get(url, params=params, headers=headers, timeout=self.config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        return _loads(resp)
+
+    def _coingecko_request(self, path, params=None, stream=False):
+        """GET a CoinGecko endpoint through the rate limiter, retrying on 429."""
+        url = f"{COINGECKO_BASE_URL}{path}"
+        for attempt in range(self.config.PROVIDER_RETRY_ATTEMPTS + 1):
+            # Queueing for a token counts toward the request's time budget
+            self._cg_limiter.acquire(timeout=self.config.PROVIDER_TIMEOUT)
+            resp = SESSION.get(url, params=params, stream=stream, timeout=self.config.PROVIDER_TIMEOUT)
+            if resp.status_code != 429 or attempt == self.config.PROVIDER_RETRY_ATTEMPTS:
+                break
+            resp.close()
+            delay = self._retry_delay(resp, attempt)
+            logger.warning(f"CoinGecko rate limited on {path}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+        resp.raise_for_status()
+        return resp
+
+    def _get_coingecko_json(self, path, params=None):
+        return _loads(self._coingecko_request(path, params))
+
+    def _get_coingecko_ids(self, path):
+        """
+        The `id` of every item in a CoinGecko list endpoint, parsed as the
+        body streams in so the full list of objects is never held in memory.
+        """
+        with self._coingecko_request(path, stream=True) as resp:
+            resp.raw.decode_content = True
+            try:
+                return list(ijson.items(resp.raw, 'item.id'))
+            except ijson.JSONError as e:
+                raise requests.exceptions.InvalidJSONError(f"Invalid JSON from {resp.url}: {e}", response=resp)
+
+    def _retry_delay(self, resp, attempt):
+        retry_after = resp.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), COINGECKO_MAX_BACKOFF)
+        backoff = self.config.PROVIDER_BACKOFF_FACTOR * (2 ** attempt)
+        return min(backoff + random.uniform(0, backoff), COINGECKO_MAX_BACKOFF)
+
+    # Historical data
+    def get_market_data(self, coin_id, days, exchange=None):
+        """
+        Fetch OHLC candles plus volume and market cap history for a coin.
+        CoinGecko aggregates across exchanges, so `exchange` is informational only.
+        Returns a MarketData whose df is indexed by timestamp.
+        """
+        return self.cache_service.get_or_fetch(
+            f"market_data_{coin_id}_{days}",
+            lambda: self._fetch_market_data(coin_id, days),
+            namespace='market'
+        )
 
-    # ... rest of your provider API code ...
+    def _fetch_market_data(self, coin_id, days):
+        params = {'vs_currency': 'usd', 'days': days}
+        # The two endpoints are independent, so wait on one round trip instead of two
+        ohlc_future = self.executor.submit(
+            self._get_coingecko_json, f"/coins/{coin_id}/ohlc", params
+        )
+        chart_future = self.executor.submit(
+            self._get_coingecko_json, f"/coins/{coin_id}/market_chart", params
+        )
+        try:
+            ohlc = ohlc_future.result()
+            chart = chart_future.result()
+        except requests.RequestException as e:
+            raise DataFetchError(f"CoinGecko request failed for {coin_id}: {e}")
+        if not ohlc:
+            raise DataFetchError(f"No OHLC data returned for {coin_id}")
+
+        # Transposed copy so each column is contiguous for the daily kernel
+        timestamps, o, h, l, c = np.asarray(ohlc, dtype=np.float64).T.copy()
+        columns = (
+            o, h, l, c,
+            _align_to(timestamps, chart['total_volumes']),
+            _align_to(timestamps, chart['market_caps'])
+        )
+
+        # Up to 90 days CoinGecko returns intraday candles; roll them up to daily
+        if days <= 90:
+            timestamps, *columns = _daily_ohlcv(timestamps, *columns)
+
+        df = pd.DataFrame(
+            dict(zip(['open', 'high', 'low', 'close', 'volume', 'market_cap'], columns)),
+            index=pd.to_datetime(timestamps, unit='ms').rename('timestamp')
+        )
+        if days <= 90:
+            df = df.dropna()
+
+        return MarketData(df=df)
+
+    def get_volume_data(self, coin_id, days):
+        """Daily 24h trading volume for a coin as a list of {timestamp, volume} records."""
+        # Whole-day window ending at the next UTC midnight, so requests on the
+        # same day share one upstream call and cache key
+        to_ts = (int(time.time()) // 86400 + 1) * 86400
+        from_ts = to_ts - days * 86400
+        return self.cache_service.get_or_fetch(
+            f"volume_{coin_id}_{from_ts}_{to_ts}",
+            lambda: self._fetch_volume_data(coin_id, from_ts, to_ts),
+            namespace='market'
+        )
+
+    def _fetch_volume_data(self, coin_id, from_ts, to_ts):
+        chart = self._get_coingecko_json(
+            f"/coins/{coin_id}/market_chart/range",
+            params={'vs_currency': 'usd', 'from': from_ts, 'to': to_ts}
+        )
+        points = np.asarray(chart['total_volumes'], dtype=np.float64).reshape(-1, 2)
+        points = points[~np.isnan(points[:, 1])]
+        # Last point of each UTC day: where the day number changes on the next row
+        day = points[:, 0] // MS_PER_DAY
+        last = np.flatnonzero(np.diff(day, append=np.inf))
+        day_starts = (day[last] * MS_PER_DAY).astype(np.int64).astype('datetime64[ms]')
+        timestamps = np.datetime_as_string(day_starts, unit='s').tolist()
+        return [
+            {'timestamp': t, 'volume': v}
+            for t, v in zip(timestamps, points[last, 1].tolist())
+        ]
+
+    def get_supported_coins(self):
+        cached = self.cache_service.get('supported_coins', namespace='coins')
+        if cached is not None:
+            return cached
+        coin_ids = self._get_coingecko_ids("/coins/list")
+        self.cache_service.set('supported_coins', coin_ids, namespace='coins')
+        return coin_ids
+
+    def get_supported_exchanges(self):
+        cached = self.cache_service.get('supported_exchanges', namespace='exchanges')
+        if cached is not None:
+            return cached
+        exchange_ids = self._get_coingecko_ids("/exchanges/list")
+        self.cache_service.set('supported_exchanges', exchange_ids, namespace='exchanges')
+        return exchange_ids
+
+    # Realtime data
+    def get_realtime_data(self, coin_id):
+        """Consensus (median) price, market cap, volume and 24h change across providers."""
+        def ttl(realtime):
+            # Don't pin an empty consensus for the whole TTL when every provider failed
+            if not realtime["sources"]:
+                return 0
+            return self._realtime_ttl(coin_id, realtime["price"])
+        # Concurrent misses for the same coin share one provider fan-out
+        return self.cache_service.get_or_fetch(
+            f"realtime_{coin_id}", lambda: self._fetch_realtime(coin_id),
+            namespace='realtime', ttl=ttl
+        )
+
+    def _fetch_realtime(self, coin_id):
+        # Usually just CoinGecko: the same deadline and bookkeeping apply to a single provider
+        providers = self._coverage.get(coin_id, [self._get_coingecko])
+        results = self._fetch_quotes(coin_id, providers)
+        return {
+            **consensus_quote(results),
+            "sources": [r["provider"] for r in results]
+        }
+
+    def cached_ttl(self, coin_id, days):
+        """
+        Seconds until either the cached quotes for `coin_id` or its `days`
+        of history expire; 0 if either isn't cached.
+        """
+        return min(
+            self.cache_service.remaining_ttl(f"realtime_{coin_id}", namespace='realtime'),
+            self.cache_service.remaining_ttl(f"market_data_{coin_id}_{days}", namespace='market')
+        )
+
+    def _realtime_ttl(self, coin_id, price):
+        """
+        Cache lifetime for a coin's quotes, scaled by how fast its price has
+        been moving: volatile coins refresh often, quiet ones are kept longer.
+        """
+        base_ttl = self.config.CACHE_TTL_REALTIME
+        now = time.monotonic()
+        last_price, last_time = self._last_price.get(coin_id, (None, None))
+        self._last_price[coin_id] = (price, now)
+        if not price or not last_price or now <= last_time:
+            return base_ttl
+        # Per second, so the TTL we pick doesn't scale the next measurement
+        rate = abs(price - last_price) / last_price / (now - last_time)
+        drift, samples, last_ttl = self._price_drift.get(coin_id, (None, 0, base_ttl))
+        drift = rate if drift is None else drift + EWMA_ALPHA * (rate - drift)
+        samples += 1
+        # Providers often repeat a price between their own updates, so a flat
+        # reading says nothing yet about how long the quote stays good
+        if drift <= 0:
+            ttl = base_ttl
+        else:
+            ttl = self.config.REALTIME_TARGET_DRIFT / drift
+            if samples < self.config.REALTIME_MIN_SAMPLES:
+                ttl = min(ttl, base_ttl)
+            # Grow at most REALTIME_TTL_GROWTH-fold per fetch; shrink right away
+            ttl = min(ttl, max(last_ttl, base_ttl) * REALTIME_TTL_GROWTH)
+        ttl = min(max(ttl, self.config.REALTIME_TTL_MIN), self.config.REALTIME_TTL_MAX)
+        self._price_drift[coin_id] = (drift, samples, ttl)
+        return ttl
+
+    def _fetch_quotes(self, coin_id, providers):
+        """
+        Query the top-ranked of `providers` concurrently and return as soon
+        as REALTIME_QUORUM of them (or all, if fewer) have answered,
+        cancelling the rest. The remaining providers are only tried if the
+        whole shortlist fails.
+        Whatever has arrived by REALTIME_TIMEOUT is returned as is.
+        Providers whose circuit breaker is open are left out; request errors
+        raised by a provider count against its breaker, answers without a
+        price and client-side rate limit timeouts don't. Calls still running
+        when we stop waiting are booked whenever they finish.
+        """
+        ranked = sorted(
+            (p for p in providers if self._breaker.available(p.__name__)),
+            key=self._expected_wait
+        )
+        quorum = min(REALTIME_QUORUM, len(ranked))
+        deadline = time.monotonic() + self.config.REALTIME_TIMEOUT
+        results = []
+        for batch in (ranked[:REALTIME_SHORTLIST], ranked[REALTIME_SHORTLIST:]):
+            started = time.monotonic()
+            pending = {
+                self.executor.submit(p, coin_id): p
+                for p in batch if self._breaker.allow(p.__name__)
+            }
+            while pending and len(results) < quorum:
+                done, _ = wait(
+                    pending,
+                    timeout=max(deadline - time.monotonic(), 0),
+                    return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    logger.warning(f"Realtime quotes for {coin_id} timed out with {len(results)} answers")
+                    break
+                for future in done:
+                    result = self._settle(pending.pop(future), future, started)
+                    if result is not None:
+                        results.append(result)
+            cutoff = time.monotonic()
+            for future, provider in pending.items():
+                if future.cancel():
+                    # Never got a thread; counts as a timeout for ranking but
+                    # says nothing about the provider's health
+                    self._record_answer(provider, False, cutoff - started)
+                else:
+                    # Still running: book the real outcome whenever it lands,
+                    # so slow or hanging providers sink and trip their breaker
+                    future.add_done_callback(functools.partial(self._settle, provider, started=started))
+            if results or time.monotonic() >= deadline:
+                break
+        return results
+
+    def _settle(self, provider, future, started):
+        """Record how `provider`'s finished call went and return its quote, or None."""
+        failed = False
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"{provider.__name__} raised: {e}")
+            result = None
+            # Our own rate limiter turning a call away says nothing
+            # about the provider, and a batched lookup hands the same
+            # timeout to every coin in the batch
+            failed = (isinstance(e, requests.RequestException)
+                      and not isinstance(e, RateLimitTimeout))
+        # An empty or unrecognised payload parses to a quote of all Nones
+        if result is not None and result.get('price') is None:
+            result = None
+        self._record_answer(provider, result is not None, time.monotonic() - started)
+        self._breaker.record(provider.__name__, not failed)
+        return result
+
+    def _expected_wait(self, provider):
+        """Average seconds spent per useful answer; lower ranks first."""
+        name = provider.__name__
+        return self._latency[name] / max(self._answer_rate[name], 0.01)
+
+    def _record_answer(self, provider, answered, elapsed):
+        name = provider.__name__
+        self._answer_rate[name] += EWMA_ALPHA * (float(answered) - self._answer_rate[name])
+        self._latency[name] += EWMA_ALPHA * (elapsed - self._latency[name])
+
+    def _fetch_coingecko_quotes(self, coin_ids):
+        return self._get_coingecko_json(
+            "/simple/price",
+            params={'ids': ','.join(coin_ids), **COINGECKO_QUOTE_PARAMS}
+        )
+
+    def _get_coingecko(self, coin_id):
+        data = self._coingecko_batch.get(coin_id)
+        # CoinGecko leaves unknown ids out of the response rather than erroring
+        if not data:
+            return None
+        return {
+            "price": data.get('usd'),
+            "market_cap": data.get('usd_market_cap'),
+            "volume_24h": data.get('usd_24h_vol'),
+            "price_change_24h": data.get('usd_24h_change'),
+            "provider": "coingecko"
+        }
+
+    def _get_coincap(self, coin_id):
+        asset_id = COINCAP_IDS.get(coin_id)
+        if not asset_id:
+            return None
+        data = self._get_json(COINCAP_ASSET_URL % asset_id).get('data', {})
+        return {
+            "price": _to_float(data.get('priceUsd')),
+            "market_cap": _to_float(data.get('marketCapUsd')),
+            "volume_24h": _to_float(data.get('volumeUsd24Hr')),
+            "price_change_24h": _to_float(data.get('changePercent24Hr')),
+            "provider": "coincap"
+        }
+
+    def _get_coinlore(self, coin_id):
+        ticker_id = COINLORE_IDS.get(coin_id)
+        if not ticker_id:
+            return None
+        tickers = self._get_json(COINLORE_TICKER_URL, params={'id': ticker_id})
+        data = tickers[0] if tickers else {}
+        return {
+            "price": _to_float(data.get('price_usd')),
+            "market_cap": _to_float(data.get('market_cap_usd')),
+            "volume_24h": _to_float(data.get('volume24')),
+            "price_change_24h": _to_float(data.get('percent_change_24h')),
+            "provider": "coinlore"
+        }
+
+    def _get_coinpaprika(self, coin_id):
+        paprika_id = COINPAPRIKA_IDS.get(coin_id)
+        if not paprika_id:
+            return None
+        data = self._get_json(
+            COINPAPRIKA_TICKER_URL % paprika_id,
+            headers=self._coinpaprika_headers
+        ).get('quotes', {}).get('USD', {})
+        return {
+            "price": data.get('price'),
+            "market_cap": data.get('market_cap'),
+            "volume_24h": data.get('volume_24h'),
+            "price_change_24h": data.get('percent_change_24h'),
+            "provider": "coinpaprika"
+        }
+
+    def _fetch_cryptocompare_quotes(self, symbols):
+        return self._get_json(
+            CRYPTOCOMPARE_QUOTES_URL,
+            params={'fsyms': ','.join(symbols), 'tsyms': 'USD'},
+            headers=self._cryptocompare_headers
+        ).get('RAW', {})
+
+    def _get_cryptocompare(self, coin_id):
+        symbol = TICKER_SYMBOLS.get(coin_id)
+        if not symbol:
+            return None
+        data = (self._cryptocompare_batch.get(symbol) or {}).get('USD', {})
+        return {
+            "price": data.get('PRICE'),
+            "market_cap": data.get('MKTCAP'),
+            "volume_24h": data.get('VOLUME24HOURTO'),
+            "price_change_24h": data.get('CHANGEPCT24HOUR'),
+            "provider": "cryptocompare"
+        }
+
+    def _fetch_coinmarketcap_quotes(self, symbols):
+        return self._get_json(
+            COINMARKETCAP_QUOTES_URL,
+            params={'symbol': ','.join(symbols)},
+            headers=self._coinmarketcap_headers
+        ).get('data', {})
+
+    def _get_coinmarketcap(self, coin_id):
+        symbol = TICKER_SYMBOLS.get(coin_id)
+        if not symbol:
+            return None
+        data = (self._coinmarketcap_batch.get(symbol) or {}).get('quote', {}).get('USD', {})
+        return {
+            "price": data.get('price'),
+            "market_cap": data.get('market_cap'),
+            "volume_24h": data.get('volume_24h'),
+            "price_change_24h": data.get('percent_change_24h'),
+            "provider": "coinmarketcap"
+        }
@@ -1,8 +1,13 @@
+import functools
+import orjson
 import requests
 import time
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 from config import Config
+from utils.circuit_breaker import CircuitBreaker
 
 # Initialize logger
 logger = logging.getLogger("market_data")
@@ -11,9 +16,24 @@ logging.basicConfig(level=logging.INFO)
 # Short-term cache for coin data
 cache = TTLCache(maxsize=1000, ttl=Config.CACHE_TTL_SECONDS)
 
+# Shared keep-alive pool so repeat calls to a provider skip the TCP+TLS handshake.
+# Retries stay in get_market_data's loop rather than the adapter.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Runs provider fetches side by side instead of one after another
+_executor = ThreadPoolExecutor(max_workers=16)
+
+# Providers that keep failing are skipped until their cool-down has passed
+breaker = CircuitBreaker(Config.BREAKER_FAILURE_THRESHOLD, Config.BREAKER_COOLDOWN)
+
+# Head start each provider gets before the next one in the chain is launched
+HEDGE_DELAY = 0.1
+
 class MarketDataProvider:
-    def __init__(self, name):
+    def __init__(self, name, session=SESSION):
         self.name = name
+        self.session = session
 
     def fetch(self, symbol):
         raise NotImplementedError
@@ -27,149 +47,146 @@ class MarketDataProvider:
 # Provider implementations
 
 class CoinGeckoProvider(MarketDataProvider):
+    URL = "https://api.coingecko.com/api/v3/coins/%s"
+
     def __init__(self):
         super().__init__('CoinGecko')
 
     def fetch(self, symbol):
-        try:
-            url = f"https://api.coingecko.com/api/v3/coins/{symbol.lower()}"
-            resp = requests.get(url, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-            market_data = data.get('market_data', {})
-            return {
-                "price": market_data.get('current_price', {}).get('usd'),
-                "market_cap": market_data.get('market_cap', {}).get('usd'),
-                "volume_24h": market_data.get('total_volume', {}).get('usd'),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
+        resp = self.session.get(self.URL % symbol.lower(), timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        market_data = data.get('market_data', {})
+        return {
+            "price": market_data.get('current_price', {}).get('usd'),
+            "market_cap": market_data.get('market_cap', {}).get('usd'),
+            "volume_24h": market_data.get('total_volume', {}).get('usd'),
+            "provider": self.name
+        }
 
 class CoinCapProvider(MarketDataProvider):
+    URL = "https://api.coincap.io/v2/assets/%s"
+
     def __init__(self):
         super().__init__('CoinCap')
 
     def fetch(self, symbol):
-        try:
-            url = f"https://api.coincap.io/v2/assets/{symbol.lower()}"
-            resp = requests.get(url, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json().get('data', {})
-            return {
-                "price": float(data.get('priceUsd', 0)),
-                "market_cap": float(data.get('marketCapUsd', 0)),
-                "volume_24h": float(data.get('volumeUsd24Hr', 0)),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
+        resp = self.session.get(self.URL % symbol.lower(), timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content).get('data', {})
+        return {
+            "price": float(data.get('priceUsd', 0)),
+            "market_cap": float(data.get('marketCapUsd', 0)),
+            "volume_24h": float(data.get('volumeUsd24Hr', 0)),
+            "provider": self.name
+        }
 
 class CoinLoreProvider(MarketDataProvider):
+    URL = "https://api.coinlore.net/api/ticker/?id=%s"
+
     def __init__(self):
         super().__init__('CoinLore')
 
     def fetch(self, symbol):
-        try:
-            url = f"https://api.coinlore.net/api/ticker/?id={symbol}"
-            resp = requests.get(url, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()[0] if resp.json() else {}
-            return {
-                "price": float(data.get('price_usd', 0)),
-                "market_cap": float(data.get('market_cap_usd', 0)),
-                "volume_24h": float(data.get('volume24', 0)),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
+        resp = self.session.get(self.URL % symbol, timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        tickers = orjson.loads(resp.content)
+        data = tickers[0] if tickers else {}
+        return {
+            "price": float(data.get('price_usd', 0)),
+            "market_cap": float(data.get('market_cap_usd', 0)),
+            "volume_24h": float(data.get('volume24', 0)),
+            "provider": self.name
+        }
 
 class CoinPaprikaProvider(MarketDataProvider):
+    URL = "https://api.coinpaprika.com/v1/tickers/%s"
+
     def __init__(self, api_key=None):
         super().__init__('CoinPaprika')
         self.api_key = api_key
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
 
     def fetch(self, symbol):
-        try:
-            url = f"https://api.coinpaprika.com/v1/tickers/{symbol.lower()}"
-            headers = {}
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
-            resp = requests.get(url, headers=headers, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-            return {
-                "price": float(data.get('price_usd', 0)),
-                "market_cap": float(data.get('market_cap_usd', 0)),
-                "volume_24h": float(data.get('volume_24h', 0)),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
+        resp = self.session.get(self.URL % symbol.lower(), headers=self.headers, timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        return {
+            "price": float(data.get('price_usd', 0)),
+            "market_cap": float(data.get('market_cap_usd', 0)),
+            "volume_24h": float(data.get('volume_24h', 0)),
+            "provider": self.name
+        }
 
 class CryptoCompareProvider(MarketDataProvider):
+    URL = "https://min-api.cryptocompare.com/data/pricemultifull?fsyms=%s&tsyms=USD"
+
     def __init__(self, api_key=None):
         super().__init__('CryptoCompare')
         self.api_key = api_key
+        self.headers = {'Authorization': f"Apikey {api_key}"} if api_key else {}
 
     def fetch(self, symbol):
-        try:
-            url = f"https://min-api.cryptocompare.com/data/pricemultifull?fsyms={symbol.upper()}&tsyms=USD"
-            headers = {}
-            if self.api_key:
-                headers['Authorization'] = f"Apikey {self.api_key}"
-            resp = requests.get(url, headers=headers, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json().get('RAW', {}).get(symbol.upper(), {}).get('USD', {})
-            return {
-                "price": data.get('PRICE'),
-                "market_cap": data.get('MKTCAP'),
-                "volume_24h": data.get('VOLUME24HOUR'),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
+        resp = self.session.get(self.URL % symbol.upper(), headers=self.headers, timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content).get('RAW', {}).get(symbol.upper(), {}).get('USD', {})
+        return {
+            "price": data.get('PRICE'),
+            "market_cap": data.get('MKTCAP'),
+            "volume_24h": data.get('VOLUME24HOUR'),
+            "provider": self.name
+        }
 
 class CoinMarketCapProvider(MarketDataProvider):
+    URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+
     def __init__(self, api_key=None):
         super().__init__('CoinMarketCap')
         self.api_key = api_key
+        self.headers = {'X-CMC_PRO_API_KEY': api_key} if api_key else {}
 
     def fetch(self, symbol):
-        try:
-            url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-            params = {"symbol": symbol.upper()}
-            headers = {}
-            if self.api_key:
-                headers['X-CMC_PRO_API_KEY'] = self.api_key
-            resp = requests.get(url, headers=headers, params=params, timeout=Config.PROVIDER_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json().get('data', {}).get(symbol.upper(), {}).get('quote', {}).get('USD', {})
-            return {
-                "price": data.get('price'),
-                "market_cap": data.get('market_cap'),
-                "volume_24h": data.get('volume_24h'),
-                "provider": self.name
-            }
-        except Exception as e:
-            logger.error(f"{self.name} error: {e}")
-            return None
-
-# Provider registry
+        params = {"symbol": symbol.upper()}
+        resp = self.session.get(self.URL, headers=self.headers, params=params, timeout=Config.PROVIDER_TIMEOUT)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content).get('data', {}).get(symbol.upper(), {}).get('quote', {}).get('USD', {})
+        return {
+            "price": data.get('price'),
+            "market_cap": data.get('market_cap'),
+            "volume_24h": data.get('volume_24h'),
+            "provider": self.name
+        }
+
+# Provider registry; providers hold no per-symbol state, so one chain is built and shared
+@functools.lru_cache(maxsize=1)
 def get_provider_chain():
-    return [
+    return (
         CoinGeckoProvider(),
         CoinCapProvider(),
         CoinLoreProvider(),
         CoinPaprikaProvider(api_key=Config.COINPAPRIKA_API_KEY),
         CryptoCompareProvider(api_key=Config.CRYPTOCOMPARE_API_KEY),
         CoinMarketCapProvider(api_key=Config.COINMARKETCAP_API_KEY),
-    ]
+    )
+
+def _fetch_with_retries(provider, symbol):
+    # Only request errors count against the breaker; a provider that answers
+    # without data for this symbol is still healthy
+    failed = False
+    for attempt in range(Config.PROVIDER_RETRY_ATTEMPTS):
+        try:
+            result = provider.fetch(symbol)
+            failed = False
+            if result and result["price"] is not None:
+                breaker.record(provider.name, True)
+                return result
+            logger.info(f"No data from {provider.name} (attempt {attempt+1})")
+        except Exception as e:
+            logger.error(f"Provider {provider.name} attempt {attempt+1}: {e}")
+            failed = isinstance(e, (requests.RequestException, orjson.JSONDecodeError))
+            time.sleep(Config.PROVIDER_BACKOFF_FACTOR * (2 ** attempt))
+    breaker.record(provider.name, not failed)
+    return None
 
 def get_market_data(symbol):
     cache_key = f"{symbol}:market_data"
@@ -178,22 +195,31 @@ def get_market_data(symbol):
         logger.info(f"Serving {symbol} from cache (provider: {cached['provider']})")
         return cached
 
-    for provider in get_provider_chain():
-        for attempt in range(Config.PROVIDER_RETRY_ATTEMPTS):
-            try:
-                result = provider.fetch(symbol)
-                if result and result["price"] is not None:
-                    cache[cache_key] = {
-                        **result,
-                        "timestamp": time.time()
-                    }
-                    logger.info(f"Fetched {symbol} from {provider.name}")
-                    return cache[cache_key]
-                else:
-                    logger.info(f"No data from {provider.name}, trying next...")
-            except Exception as e:
-                logger.error(f"Provider {provider.name} attempt {attempt+1}: {e}")
-                time.sleep(Config.PROVIDER_BACKOFF_FACTOR * (2 ** attempt))
+    # Hedged race: launch providers in chain order, each HEDGE_DELAY after the
+    # last (or right away once one comes back empty); the first good answer wins
+    chain = [provider for provider in get_provider_chain() if breaker.available(provider.name)]
+    pending = set()
+    launched = 0
+    while launched < len(chain) or pending:
+        if launched < len(chain):
+            provider = chain[launched]
+            launched += 1
+            # A half-open provider may have had its probe claimed since the chain was built
+            if breaker.allow(provider.name):
+                pending.add(_executor.submit(_fetch_with_retries, provider, symbol))
+        timeout = HEDGE_DELAY if launched < len(chain) else None
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if result:
+                for other in pending:
+                    other.cancel()
+                cache[cache_key] = {
+                    **result,
+                    "timestamp": time.time()
+                }
+                logger.info(f"Fetched {symbol} from {result['provider']}")
+                return cache[cache_key]
     # All providers failed
     logger.error(f"All providers failed for {symbol}")
     return None
@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import Future
+
+class RequestBatcher:
+    """
+    Coalesces lookups made within `window` seconds of each other (up to
+    `max_size` keys) into one `fetch_many(keys)` call returning
+    {key: value}. Keys missing from the result resolve to None, and an
+    exception from `fetch_many` is raised to every caller in the batch.
+    Every caller's lookup is resolved even if the fetching caller is
+    interrupted part-way.
+    """
+
+    def __init__(self, fetch_many, window=0.02, max_size=50):
+        self.fetch_many = fetch_many
+        self.window = window
+        self.max_size = max_size
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Value for `key`, fetched together with any concurrent lookups."""
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = {}
+            future = batch.get(key)
+            if future is None:
+                future = batch[key] = Future()
+            full = len(batch) >= self.max_size
+            if full and self._batch is batch:
+                self._batch = None
+        if leader:
+            # The first caller waits out the window, then fetches on behalf of everyone
+            try:
+                if not full:
+                    time.sleep(self.window)
+                with self._lock:
+                    if self._batch is batch:
+                        self._batch = None
+                self._run(batch)
+            finally:
+                # If the leader was interrupted (a gevent Timeout, GreenletExit...)
+                # close the batch and fail whoever is still waiting on it
+                with self._lock:
+                    if self._batch is batch:
+                        self._batch = None
+                for pending in batch.values():
+                    if not pending.done():
+                        pending.set_exception(RuntimeError("Batched fetch was interrupted"))
+        return future.result()
+
+    def _run(self, batch):
+        try:
+            values = self.fetch_many(list(batch))
+            results = {key: values.get(key) for key in batch}
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            future.set_result(results[key])
@@ -0,0 +1,54 @@
+import threading
+import time
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker: after `threshold` consecutive failures a
+    provider is skipped for `cooldown` seconds. Once the cool-down passes a
+    single probe call is let through (half-open); its success closes the
+    breaker, and a failure reopens it for another cool-down.
+    """
+
+    def __init__(self, threshold=3, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def available(self, name):
+        """Whether `name` is closed or due a probe. Doesn't claim the probe."""
+        state = self._state.get(name)
+        return state is None or time.monotonic() >= state['open_until']
+
+    def allow(self, name):
+        """
+        Whether `name` may be called right now. In the half-open state only
+        the first caller gets through; the probe slot is held for another
+        cool-down, so a probe that never reports back doesn't wedge it.
+        """
+        with self._lock:
+            state = self._state.get(name)
+            if state is None or state['fails'] < self.threshold:
+                return True
+            now = time.monotonic()
+            if now < state['open_until']:
+                return False
+            state['open_until'] = now + self.cooldown
+            return True
+
+    def record(self, name, ok):
+        """Count a success (closing the breaker) or a failure for `name`."""
+        with self._lock:
+            state = self._state.setdefault(name, {'fails': 0, 'open_until': 0.0})
+            if ok:
+                state['fails'] = 0
+                state['open_until'] = 0.0
+                return
+            state['fails'] += 1
+            if state['fails'] >= self.threshold:
+                state['open_until'] = time.monotonic() + self.cooldown
+
+    def open_names(self):
+        """Names whose breaker is currently open."""
+        now = time.monotonic()
+        return sorted(name for name, state in self._state.items() if now < state['open_until'])
@@ -0,0 +1,28 @@
+from datetime import date
+
+import orjson
+from flask.json.provider import JSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    # pandas.Timestamp subclasses datetime, which orjson only handles exactly
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj):
+    """Serialize `obj` straight to UTF-8 JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
@@ -0,0 +1,44 @@
+import threading
+import time
+
+import requests
+
+class RateLimitTimeout(requests.RequestException):
+    """No token became available within the caller's timeout."""
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` calls per `period` seconds."""
+
+    def __init__(self, rate, period=60.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """
+        Block until a token is available, then take it. With a `timeout`,
+        raise RateLimitTimeout as soon as it's clear none will be free in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.fill_rate
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitTimeout(f"No rate limit token free within {timeout}s")
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
@@ -1,15 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.json_provider import dumps_bytes
+
+
 class ResponseFormatter:
     """Formatter for API responses."""
 
     def format_market_response(self, market_data, signals, realtime_data, coin_id):
-        # Ensure index alignment by reindexing signals to match historical data
-        base_index = market_data.df.index
-        formatted_signals = {
-            k: v.reindex(base_index).dropna().to_dict() for k, v in signals.items()
-        }
         return {
             'coin_id': coin_id,
             'historical_data': market_data.df.reset_index().to_dict(orient='records'),
-            'signals': formatted_signals,
+            'signals': self._signal_points(market_data.df.index, signals),
+            'realtime': realtime_data
+        }
+
+    def format_market_response_bytes(self, market_data, signals, realtime_data, coin_id):
+        """
+        Same document as format_market_response, serialized straight to JSON
+        bytes. History rows are zipped from plain column lists rather than
+        going through DataFrame.to_dict.
+        """
+        df = market_data.df
+        columns = [df.index.name or 'index', *df.columns]
+        values = [df.index.to_pydatetime().tolist(), *(df[c].to_numpy().tolist() for c in df.columns)]
+        return dumps_bytes({
+            'coin_id': coin_id,
+            'historical_data': [dict(zip(columns, row)) for row in zip(*values)],
+            'signals': self._signal_points(df.index, signals),
             'realtime': realtime_data
+        })
+
+    def _signal_points(self, base_index, signals):
+        # Ensure index alignment by reindexing every signal to the historical data at once
+        sig_df = pd.DataFrame(signals).reindex(base_index)
+        # JSON object keys have to be strings, so key signal points by ISO timestamp
+        iso_index = np.asarray(base_index.strftime('%Y-%m-%dT%H:%M:%S'))
+        # Values stay numpy float32 scalars, which orjson writes in their
+        # shortest form (113.1 rather than 113.0999984741211)
+        values = sig_df.to_numpy(dtype=np.float32)
+        present = ~np.isnan(values)
+        return {
+            name: dict(zip(iso_index[present[:, i]].tolist(), values[present[:, i], i]))
+            for i, name in enumerate(sig_df.columns)
         }
@@ -1,34 +1,88 @@
+import functools
+import re
+
 from utils.exceptions import ValidationError
 
+# CoinGecko coin and exchange ids: lowercase slugs such as "usd-coin" or "binance_us"
+SLUG_PATTERN = re.compile(r'[a-z0-9][a-z0-9._-]{0,99}')
+
+# Field specs understood by InputValidator.compile:
+#   ('int', default, min, max)   integer within [min, max]
+#   ('str', default, pattern)    string matching pattern (None for any)
+#   ('str_opt', pattern)         like 'str' but may be absent (None)
+DATA_REQUEST_SCHEMA = {
+    'coin_id': ('str', 'bitcoin', SLUG_PATTERN),
+    'days': ('int', 30, 1, 365),
+    'exchange': ('str_opt', SLUG_PATTERN),
+    'group': ('str_opt', None),
+}
+
+@functools.lru_cache(maxsize=512)
+def _parse_int(value):
+    """int(value), or None if it isn't one. Memoised: most requests repeat a handful of values."""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _range_message(name, min_val, max_val):
+    return f"{name} must be an integer between {min_val} and {max_val}"
+
+
 class InputValidator:
     """Validator for input parameters."""
     
-    def validate_data_request(self, args):
-        coin_id = args.get('coin_id', 'bitcoin')
-        days = args.get('days', '30')
-        exchange = args.get('exchange')
-        group = args.get('group')
-        
-        try:
-            days = int(days)
-            if not (1 <= days <= 365):
-                raise ValueError
-        except ValueError:
-            raise ValidationError("Days must be an integer between 1 and 365")
+    def __init__(self):
+        self._validate_data_request = self.compile(DATA_REQUEST_SCHEMA)
+    
+    def compile(self, schema):
+        """
+        Build a validator for a fixed `schema` of {name: spec}. The per-field
+        checks are resolved once here, so each call just runs them over the
+        request args and returns the parsed values.
+        """
+        checks = [(name, self._compile_field(name, spec)) for name, spec in schema.items()]
         
-        # Add more validation as needed
-        return {
-            'coin_id': coin_id,
-            'days': days,
-            'exchange': exchange,
-            'group': group
-        }
+        def validate(args):
+            return {name: check(args.get(name)) for name, check in checks}
+        return validate
+    
+    def _compile_field(self, name, spec):
+        kind = spec[0]
+        if kind == 'int':
+            _, default, min_val, max_val = spec
+            message = _range_message(name.capitalize(), min_val, max_val)
+            
+            def check(value):
+                if value is None:
+                    return default
+                val = _parse_int(value)
+                if val is None or not (min_val <= val <= max_val):
+                    raise ValidationError(message)
+                return val
+            return check
+        if kind in ('str', 'str_opt'):
+            pattern = spec[-1]
+            default = spec[1] if kind == 'str' else None
+            fullmatch = pattern.fullmatch if pattern is not None else None
+            message = f"Invalid {name}"
+            
+            def check(value):
+                if not value:
+                    return default
+                if fullmatch is not None and fullmatch(value) is None:
+                    raise ValidationError(message)
+                return value
+            return check
+        raise ValueError(f"Unknown type {kind!r} for field {name!r}")
+    
+    def validate_data_request(self, args):
+        return self._validate_data_request(args)
     
     def validate_integer_param(self, value, name, min_val, max_val):
-        try:
-            val = int(value)
-            if not (min_val <= val <= max_val):
-                raise ValueError
-            return val
-        except ValueError:
-            raise ValidationError(f"{name} must be an integer between {min_val} and {max_val}")
+        val = _parse_int(value)
+        if val is None or not (min_val <= val <= max_val):
+            raise ValidationError(_range_message(name, min_val, max_val))
+        return val